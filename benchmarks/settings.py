@@ -0,0 +1,24 @@
+"""
+Settings for the benchmark harness.
+
+Runs the project against a throwaway SQLite database so benchmarks never
+touch the MySQL instance and need no network access.
+"""
+import tempfile
+from pathlib import Path
+
+from core.settings import *  # noqa: F401,F403
+
+BENCH_DIR = Path(tempfile.gettempdir()) / 'currency-bench'
+BENCH_DIR.mkdir(parents=True, exist_ok=True)
+
+DEBUG = False
+
+DATABASES = {
+    'default': {
+        'ENGINE': 'django.db.backends.sqlite3',
+        'NAME': BENCH_DIR / 'db.sqlite3',
+    }
+}
+
+MEDIA_ROOT = BENCH_DIR / 'media'
@@ -45,6 +45,7 @@ INSTALLED_APPS = [
 
 MIDDLEWARE = [
     'django.middleware.security.SecurityMiddleware',
+    'django.middleware.gzip.GZipMiddleware',
     'django.contrib.sessions.middleware.SessionMiddleware',
     'django.middleware.common.CommonMiddleware',
     'django.middleware.csrf.CsrfViewMiddleware',
@@ -137,6 +138,10 @@ REST_FRAMEWORK = {
     'DEFAULT_FILTER_BACKENDS': ['django_filters.rest_framework.DjangoFilterBackend']
 }
 
+# Rendered /countries bodies are cached per dataset version. Without a CACHES
+# setting Django uses LocMemCache, which is per process (each worker keeps its own copy).
+COUNTRIES_CACHE_TIMEOUT = config('COUNTRIES_CACHE_TIMEOUT', default=300, cast=int)
+
 MEDIA_ROOT = BASE_DIR / 'media' 
 MEDIA_URL = '/media/'
 
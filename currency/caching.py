@@ -0,0 +1,76 @@
+import hashlib
+import re
+from functools import wraps
+
+from django.core.cache import cache
+from django.core.cache.backends.base import DEFAULT_TIMEOUT
+from django.http import HttpResponse
+from django.utils.cache import get_conditional_response, patch_vary_headers
+from django.utils.text import compress_string
+
+_accepts_gzip = re.compile(r"\bgzip\b")
+
+CACHED_HEADERS = ("Content-Type", "Content-Encoding", "Vary")
+
+
+def cache_dataset_response(version_func, prefix, timeout=DEFAULT_TIMEOUT):
+    """
+    caches the rendered, and when accepted gzipped, body of a GET view.
+
+    the key covers the dataset version from `version_func`, the query string,
+    Accept and Accept-Encoding, so a refresh naturally starts a new set of entries.
+    the same key doubles as a strong ETag, matching If-None-Match gets a 304.
+    """
+    def decorator(view):
+        @wraps(view)
+        def wrapped(request, *args, **kwargs):
+            if request.method not in ("GET", "HEAD"):
+                return view(request, *args, **kwargs)
+
+            gzip = bool(_accepts_gzip.search(request.META.get("HTTP_ACCEPT_ENCODING", "")))
+            key = hashlib.md5("|".join([
+                version_func(),
+                request.GET.urlencode(),
+                request.META.get("HTTP_ACCEPT", ""),
+                "gzip" if gzip else "identity",
+            ]).encode()).hexdigest()
+            etag = f'"{key}"'
+
+            not_modified = get_conditional_response(request, etag=etag)
+            if not_modified is not None:
+                not_modified["ETag"] = etag
+                patch_vary_headers(not_modified, ("Accept", "Accept-Encoding"))
+                return not_modified
+
+            cache_key = f"{prefix}:{key}"
+            cached = cache.get(cache_key)
+            if cached is not None:
+                content, headers = cached
+                response = HttpResponse(content)
+                for header, value in headers.items():
+                    response[header] = value
+            else:
+                response = view(request, *args, **kwargs)
+                if response.status_code != 200 or response.streaming:
+                    return response
+                if hasattr(response, "render"):
+                    response.render()
+                # the browsable api page is per user, only cache data formats
+                if response.get("Content-Type", "").startswith("text/html"):
+                    return response
+
+                if gzip:
+                    compressed = compress_string(response.content)
+                    if len(compressed) < len(response.content):
+                        response.content = compressed
+                        response["Content-Encoding"] = "gzip"
+
+                headers = {h: response[h] for h in CACHED_HEADERS if response.has_header(h)}
+                cache.set(cache_key, (response.content, headers), timeout)
+
+            response["ETag"] = etag
+            response["Content-Length"] = str(len(response.content))
+            patch_vary_headers(response, ("Accept", "Accept-Encoding"))
+            return response
+        return wrapped
+    return decorator
@@ -0,0 +1,377 @@
+import contextlib
+import io
+import itertools
+import json
+import platform
+import random
+import statistics
+import time
+from concurrent.futures import ThreadPoolExecutor
+from decimal import Decimal
+from pathlib import Path
+from unittest import mock
+from urllib.parse import quote
+
+import django
+import requests
+from django.conf import settings
+from django.core.cache.backends.dummy import DummyCache
+from django.core.management import call_command
+from django.core.management.base import BaseCommand, CommandError
+from django.db import connection
+from django.test import Client
+from django.test.utils import CaptureQueriesContext
+from django.utils import timezone
+
+from currency import caching, services
+from currency.models import Country
+
+
+FIXTURES_DIR = settings.BASE_DIR / 'benchmarks' / 'fixtures'
+RESULTS_PATH = settings.BASE_DIR / 'benchmarks' / 'results' / 'latest.json'
+
+FIXTURE_FILES = {
+    services.COUNTRY_API: 'countries.json',
+    services.RATES_API: 'rates.json',
+}
+
+# a comparison is only meaningful when the runs were shaped the same way
+COMPARED_META = ("rows", "concurrency", "requests", "refresh_runs", "repeat")
+
+# must be at least 1, otherwise there is nothing to measure
+POSITIVE_OPTIONS = ("rows", "concurrency", "requests", "refresh_runs", "repeat")
+
+REGIONS = ["Africa", "Americas", "Asia", "Europe", "Oceania", "Polar"]
+FILTERS = ["", "region=afr", "currency=EUR", "region=europe&currency=EUR"]
+SORTS = ["", "gdp_desc", "gdp_asc", "name", "population", "region"]
+
+
+def _percentile(samples, pct):
+    if len(samples) < 2:
+        return samples[0] if samples else 0.0
+    return statistics.quantiles(samples, n=100, method='inclusive')[pct - 1]
+
+
+def _best_of_runs(runs):
+    """
+    folds repeated runs of one scenario into one result. the best run is kept,
+    background load only ever makes a run slower, so best-of is the stable figure
+    """
+    return {
+        "requests": sum(run["requests"] for run in runs),
+        "errors": sum(run["errors"] for run in runs),
+        "p50_ms": min(run["p50_ms"] for run in runs),
+        "p95_ms": min(run["p95_ms"] for run in runs),
+        "p99_ms": min(run["p99_ms"] for run in runs),
+        "throughput_rps": max(run["throughput_rps"] for run in runs),
+        # deterministic per run, the max still catches a run that did extra work
+        "queries_per_request": max(run["queries_per_request"] for run in runs),
+    }
+
+
+class Command(BaseCommand):
+    help = (
+        "Seeds synthetic countries into a SQLite database, replays refresh against "
+        "upstream fixtures and load-tests every endpoint. "
+        "Run with --settings=benchmarks.settings."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("--rows", type=int, default=250, help="synthetic Country rows to seed")
+        parser.add_argument("--concurrency", type=int, default=8, help="concurrent clients per scenario")
+        parser.add_argument("--requests", type=int, default=100, help="requests per read scenario")
+        parser.add_argument("--refresh-runs", type=int, default=5, help="sequential refresh calls to time")
+        parser.add_argument("--repeat", type=int, default=3, help="times each scenario is run, the best run is reported")
+        parser.add_argument("--fixtures", default=str(FIXTURES_DIR), help="directory with upstream responses (countries.json, rates.json)")
+        parser.add_argument("--output", default=str(RESULTS_PATH), help="where to write the JSON results")
+        parser.add_argument("--compare", metavar="BASELINE", help="fail if results regress against this results file")
+        parser.add_argument("--threshold", type=float, default=0.10, help="allowed regression as a fraction, e.g. 0.10 = 10%%")
+        parser.add_argument(
+            "--min-delta-ms", type=float, default=2.0,
+            help="timing changes smaller than this are treated as noise, whatever the threshold",
+        )
+        parser.add_argument(
+            "--strict-timing", action="store_true",
+            help="fail on latency/throughput regressions too, by default they only warn",
+        )
+        parser.add_argument("--seed", type=int, default=42)
+        parser.add_argument("--record", action="store_true", help="replace the fixtures with live responses from the upstream APIs and exit")
+
+    def handle(self, *args, **options):
+        fixtures_dir = Path(options["fixtures"])
+
+        if options["record"]:
+            self._record_fixtures(fixtures_dir)
+            return
+
+        for name in POSITIVE_OPTIONS:
+            if options[name] < 1:
+                raise CommandError(f"--{name.replace('_', '-')} must be at least 1.")
+        if options["threshold"] < 0 or options["min_delta_ms"] < 0:
+            raise CommandError("--threshold and --min-delta-ms cannot be negative.")
+
+        if connection.vendor != "sqlite":
+            raise CommandError(
+                "Benchmarks wipe the Country table and must run on SQLite. "
+                "Use --settings=benchmarks.settings."
+            )
+
+        output = Path(options["output"])
+        baseline = None
+        if options["compare"]:
+            baseline_path = Path(options["compare"])
+            if baseline_path.resolve() == output.resolve():
+                raise CommandError(
+                    f"--compare and --output both point at {output}, the run would overwrite its own baseline. "
+                    "Pass a different --output."
+                )
+            # read it before anything is written, so the baseline can't be clobbered
+            baseline = self._load_baseline(baseline_path)
+
+        random.seed(options["seed"])
+        fixtures = self._load_fixtures(fixtures_dir)
+
+        call_command("migrate", verbosity=0, interactive=False)
+        names = self._seed(options["rows"], fixtures[services.RATES_API]["rates"])
+        self.stdout.write(f"Seeded {len(names)} synthetic countries.")
+
+        repeat = options["repeat"]
+        requests_per_run = options["requests"]
+        concurrency = options["concurrency"]
+
+        def measure(urls, cold=False):
+            runs = [self._run_scenario(urls, requests_per_run, concurrency, cold=cold) for _ in range(repeat)]
+            return _best_of_runs(runs)
+
+        scenarios = {}
+        # services and views print progress, keep that out of the report
+        with contextlib.redirect_stdout(io.StringIO()):
+            scenarios["POST /countries/refresh"] = _best_of_runs(
+                [self._run_refresh(options["refresh_runs"], fixtures) for _ in range(repeat)]
+            )
+
+            for query, sort in itertools.product(FILTERS, SORTS):
+                params = "&".join(p for p in [query, f"sort={sort}" if sort else ""] if p)
+                url = f"/countries?{params}" if params else "/countries"
+                # cold runs filtering, ordering and serialization, cached times the response cache
+                scenarios[f"GET {url} (cold)"] = measure([url], cold=True)
+                scenarios[f"GET {url} (cached)"] = measure([url])
+
+            detail_urls = [f"/countries/{quote(name)}" for name in names]
+            scenarios["GET /countries/<name>"] = measure(detail_urls)
+            scenarios["GET /status"] = measure(["/status"])
+            scenarios["GET /countries/image"] = measure(["/countries/image"])
+
+        results = {
+            "meta": {
+                "rows": options["rows"],
+                "concurrency": options["concurrency"],
+                "requests": options["requests"],
+                "refresh_runs": options["refresh_runs"],
+                "repeat": repeat,
+                "timestamp": timezone.now().isoformat(),
+                "python": platform.python_version(),
+                "django": django.get_version(),
+            },
+            "scenarios": scenarios,
+        }
+
+        output.parent.mkdir(parents=True, exist_ok=True)
+        output.write_text(json.dumps(results, indent=2))
+
+        self._report(scenarios)
+        self.stdout.write(f"Results written to {output}")
+
+        failed = [name for name, stats in scenarios.items() if stats["errors"]]
+        if failed:
+            raise CommandError(f"Requests failed in: {', '.join(failed)}")
+
+        if baseline is not None:
+            self._compare(
+                results, baseline, Path(options["compare"]), options["threshold"],
+                min_delta_ms=options["min_delta_ms"], strict_timing=options["strict_timing"],
+            )
+
+    def _load_fixtures(self, fixtures_dir):
+        fixtures = {}
+        for url, filename in FIXTURE_FILES.items():
+            path = fixtures_dir / filename
+            if not path.exists():
+                raise CommandError(f"Missing fixture {path}. Record it with --record.")
+            fixtures[url] = json.loads(path.read_text())
+        return fixtures
+
+    def _load_baseline(self, baseline_path):
+        if not baseline_path.exists():
+            raise CommandError(f"Baseline {baseline_path} not found.")
+        try:
+            baseline = json.loads(baseline_path.read_text())
+        except ValueError as e:
+            raise CommandError(f"Baseline {baseline_path} is not valid JSON: {e}")
+        if "meta" not in baseline or "scenarios" not in baseline:
+            raise CommandError(f"Baseline {baseline_path} is not a benchmark results file.")
+        return baseline
+
+    def _record_fixtures(self, fixtures_dir):
+        fixtures_dir.mkdir(parents=True, exist_ok=True)
+        for url, filename in FIXTURE_FILES.items():
+            try:
+                response = requests.get(url, timeout=10)
+                response.raise_for_status()
+            except requests.exceptions.RequestException as e:
+                raise CommandError(f"Could not record {url}: {e}")
+            (fixtures_dir / filename).write_text(json.dumps(response.json(), indent=2, ensure_ascii=False))
+            self.stdout.write(f"Recorded {url} -> {fixtures_dir / filename}")
+
+    def _seed(self, rows, rates):
+        """replace all countries with `rows` synthetic ones, returns their names"""
+        Country.objects.all().delete()
+        codes = sorted(rates)
+        countries = []
+        for i in range(rows):
+            code = codes[i % len(codes)]
+            population = random.randint(10_000, 200_000_000)
+            exchange_rate = Decimal(str(rates[code]))
+            countries.append(
+                Country(
+                    name=f"Synthetic {i:05d}",
+                    capital=f"Capital {i:05d}",
+                    region=REGIONS[i % len(REGIONS)],
+                    population=population,
+                    currency_code=code,
+                    exchange_rate=exchange_rate,
+                    estimated_gdp=Decimal(population) * Decimal(random.uniform(1000, 2000)) / exchange_rate,
+                    flag_url=f"https://flagcdn.com/x{i}.svg",
+                )
+            )
+        Country.objects.bulk_create(countries, batch_size=500)
+        return [c.name for c in countries]
+
+    def _run_refresh(self, runs, fixtures):
+        """refresh writes to the db, so it is timed sequentially instead of concurrently"""
+        def fake_fetch(url, api_name):
+            return fixtures[url]
+
+        # the view answers 200 with a "message" on unexpected errors, so check the body too
+        def succeeded(response):
+            return response.status_code < 400 and response.json().get("status") == "success"
+
+        with mock.patch.object(services, "_fetch_api_data", side_effect=fake_fetch):
+            return self._run_scenario(["/countries/refresh"], runs, 1, method="post", check=succeeded)
+
+    def _run_scenario(self, urls, total, concurrency, method="get", check=None, cold=False):
+        if cold:
+            # a cache that never hits, so every request runs the whole view
+            with mock.patch.object(caching, "cache", DummyCache("benchmark", {})):
+                return self._run_scenario(urls, total, concurrency, method, check)
+
+        check = check or (lambda response: response.status_code < 400)
+        if method == "get":
+            # warm caches so every run measures the same steady state
+            client = Client(raise_request_exception=False)
+            for url in dict.fromkeys(urls[:total]):
+                client.get(url)
+        concurrency = max(1, min(concurrency, total))
+        # each worker gets an even share of the requests and its own client
+        shares = [total // concurrency + (1 if i < total % concurrency else 0) for i in range(concurrency)]
+        offsets = [sum(shares[:i]) for i in range(concurrency)]
+
+        def worker(offset, count):
+            # view exceptions become 500s and are counted, instead of aborting the run
+            client = Client(raise_request_exception=False)
+            samples = []
+            try:
+                for i in range(offset, offset + count):
+                    url = urls[i % len(urls)]
+                    with CaptureQueriesContext(connection) as queries:
+                        start = time.perf_counter()
+                        response = getattr(client, method)(url)
+                        elapsed = time.perf_counter() - start
+                    samples.append((elapsed, len(queries), check(response)))
+            finally:
+                connection.close()
+            return samples
+
+        start = time.perf_counter()
+        with ThreadPoolExecutor(max_workers=concurrency) as executor:
+            batches = list(executor.map(worker, offsets, shares))
+        wall = time.perf_counter() - start
+
+        samples = [s for batch in batches for s in batch]
+        latencies = [s[0] * 1000 for s in samples]
+        return {
+            "requests": len(samples),
+            "errors": sum(1 for s in samples if not s[2]),
+            "p50_ms": round(_percentile(latencies, 50), 3),
+            "p95_ms": round(_percentile(latencies, 95), 3),
+            "p99_ms": round(_percentile(latencies, 99), 3),
+            "throughput_rps": round(len(samples) / wall, 2) if wall else 0.0,
+            "queries_per_request": round(sum(s[1] for s in samples) / len(samples), 2),
+        }
+
+    def _report(self, scenarios):
+        width = max(len(name) for name in scenarios)
+        self.stdout.write(
+            f"{'scenario':<{width}}  {'p50 ms':>9}  {'p95 ms':>9}  {'p99 ms':>9}  {'req/s':>9}  {'queries':>7}"
+        )
+        for name, stats in scenarios.items():
+            self.stdout.write(
+                f"{name:<{width}}  {stats['p50_ms']:>9.2f}  {stats['p95_ms']:>9.2f}  {stats['p99_ms']:>9.2f}"
+                f"  {stats['throughput_rps']:>9.2f}  {stats['queries_per_request']:>7.2f}"
+            )
+
+    def _compare(self, results, baseline, baseline_path, threshold, min_delta_ms=2.0, strict_timing=False):
+        """
+        fails on differently shaped runs, missing scenarios and extra queries.
+        timing is gated on p50 and throughput, p95/p99 under threads are mostly
+        scheduling noise. a timing regression must beat both the relative threshold
+        and min_delta_ms, and only fails with strict_timing, otherwise it warns.
+        """
+        mismatched = [
+            f"{key}: baseline {baseline['meta'].get(key)} vs current {results['meta'][key]}"
+            for key in COMPARED_META
+            if baseline["meta"].get(key) != results["meta"][key]
+        ]
+        if mismatched:
+            raise CommandError(
+                f"Cannot compare against {baseline_path}, the runs were configured differently:\n"
+                + "\n".join(mismatched)
+            )
+
+        scenarios = results["scenarios"]
+        base_scenarios = baseline["scenarios"]
+        regressions = [f"{name}: missing from baseline" for name in scenarios if name not in base_scenarios]
+        regressions += [f"{name}: missing from this run" for name in base_scenarios if name not in scenarios]
+        timing = []
+
+        def slower(base_ms, current_ms):
+            return current_ms - base_ms > max(base_ms * threshold, min_delta_ms)
+
+        for name, stats in scenarios.items():
+            base = base_scenarios.get(name)
+            if base is None:
+                continue
+            # query counts are deterministic, any increase is a regression
+            if stats["queries_per_request"] > base["queries_per_request"]:
+                regressions.append(
+                    f"{name}: queries/request {base['queries_per_request']} -> {stats['queries_per_request']}"
+                )
+            if slower(base["p50_ms"], stats["p50_ms"]):
+                timing.append(f"{name}: p50 {base['p50_ms']}ms -> {stats['p50_ms']}ms")
+            # throughput is compared as time per request so the same noise floor applies
+            if base["throughput_rps"] and stats["throughput_rps"] and slower(
+                1000 / base["throughput_rps"], 1000 / stats["throughput_rps"]
+            ):
+                timing.append(f"{name}: throughput {base['throughput_rps']} -> {stats['throughput_rps']} req/s")
+
+        if strict_timing:
+            regressions += timing
+        elif timing:
+            self.stderr.write(self.style.WARNING(
+                f"Timing regressions beyond {threshold:.0%} and {min_delta_ms}ms (not failing, see --strict-timing):\n"
+                + "\n".join(timing)
+            ))
+
+        if regressions:
+            raise CommandError(f"Regressions against {baseline_path}:\n" + "\n".join(regressions))
+        self.stdout.write(self.style.SUCCESS(f"No regressions against {baseline_path}."))
@@ -0,0 +1,33 @@
+# Generated by Django 5.2.7 on 2026-10-19 19:04
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('currency', '0002_alter_country_capital_alter_country_region'),
+    ]
+
+    operations = [
+        migrations.AlterField(
+            model_name='country',
+            name='currency_code',
+            field=models.CharField(max_length=5, null=True),
+        ),
+        migrations.AlterField(
+            model_name='country',
+            name='estimated_gdp',
+            field=models.DecimalField(blank=True, decimal_places=2, editable=False, max_digits=20, null=True),
+        ),
+        migrations.AlterField(
+            model_name='country',
+            name='exchange_rate',
+            field=models.DecimalField(blank=True, decimal_places=6, max_digits=20, null=True),
+        ),
+        migrations.AlterField(
+            model_name='country',
+            name='population',
+            field=models.BigIntegerField(blank=True, null=True),
+        ),
+    ]
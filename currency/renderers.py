@@ -0,0 +1,42 @@
+import msgpack
+from rest_framework.renderers import BaseRenderer, JSONRenderer
+
+
+def _to_columns(data, fields=None):
+    """turns a list of rows into one array per field, other payloads pass through"""
+    if not isinstance(data, list) or (data and not isinstance(data[0], dict)):
+        return data
+
+    # an empty list still gets the full shape, using the serializer fields
+    fields = list(data[0].keys()) if data else list(fields or [])
+    return {
+        "fields": fields,
+        "count": len(data),
+        "columns": {field: [row.get(field) for row in data] for field in fields},
+    }
+
+
+class MessagePackRenderer(BaseRenderer):
+    """binary MessagePack output, selected with ?format=msgpack"""
+    media_type = "application/msgpack"
+    format = "msgpack"
+    charset = None
+    render_style = "binary"
+
+    def render(self, data, accepted_media_type=None, renderer_context=None):
+        if data is None:
+            return b""
+        # serializer output is already primitive, str() covers anything left over
+        return msgpack.packb(data, use_bin_type=True, default=str)
+
+
+class ColumnarJSONRenderer(JSONRenderer):
+    """compact JSON with one array per field, selected with ?format=columnar"""
+    media_type = "application/vnd.columnar+json"
+    format = "columnar"
+    compact = True
+
+    def render(self, data, accepted_media_type=None, renderer_context=None):
+        view = (renderer_context or {}).get("view")
+        fields = view.get_serializer().fields.keys() if hasattr(view, "get_serializer") else None
+        return super().render(_to_columns(data, fields), accepted_media_type, renderer_context)
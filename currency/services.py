@@ -91,10 +91,11 @@ def refresh_country_data():
     countries_to_create = []
     countries_to_update = []
     
-    # Fields that we will update in bulk
+    # Fields that we will update in bulk.
+    # bulk_update skips auto_now, so last_refreshed_at is set by hand
     update_fields = [
         'capital', 'region', 'population', 'flag_url',
-        'currency_code', 'exchange_rate', 'estimated_gdp'
+        'currency_code', 'exchange_rate', 'estimated_gdp', 'last_refreshed_at'
     ]
 
     for country in country_data:
@@ -136,6 +137,7 @@ def refresh_country_data():
             obj.currency_code = currency_code
             obj.exchange_rate = exchange_rate
             obj.estimated_gdp = estimated_gdp
+            obj.last_refreshed_at = last_refresh_time
             countries_to_update.append(obj)
         else:
             # Country is new, add to CREATE list
@@ -1,3 +1,222 @@
-from django.test import TestCase
+import gzip
+import io
+import json
+import tempfile
+from decimal import Decimal
+from pathlib import Path
+from unittest import mock, skipUnless
 
-# Create your tests here.
+import msgpack
+from django.core.cache import cache
+from django.core.management import call_command
+from django.core.management.base import CommandError
+from django.db import connection
+from django.test import SimpleTestCase, TestCase, TransactionTestCase, override_settings
+
+from . import services
+from .management.commands.benchmark import Command as BenchmarkCommand, _percentile
+from .models import Country
+
+
+COUNTRIES = [
+    {"name": "Nigeria", "capital": "Abuja", "region": "Africa", "population": 206139587,
+     "flag": "https://flagcdn.com/ng.svg", "currencies": [{"code": "NGN"}]},
+    {"name": "Ghana", "capital": "Accra", "region": "Africa", "population": 31072945,
+     "flag": "https://flagcdn.com/gh.svg", "currencies": [{"code": "GHS"}]},
+]
+RATES = {"rates": {"NGN": 1535.21, "GHS": 10.87}}
+
+
+def _fake_fetch(url, api_name):
+    return RATES if url == services.RATES_API else COUNTRIES
+
+
+class CountryListFormatTests(TestCase):
+    def setUp(self):
+        cache.clear()
+        for i in range(3):
+            Country.objects.create(
+                name=f"Country {i}", region="Africa", population=1000 + i,
+                currency_code="NGN", exchange_rate=Decimal("1500"), estimated_gdp=Decimal(i * 10),
+            )
+
+    def test_msgpack_matches_json_rows(self):
+        rows = self.client.get("/countries").json()
+
+        response = self.client.get("/countries?format=msgpack")
+        self.assertEqual(response["Content-Type"], "application/msgpack")
+        self.assertEqual(msgpack.unpackb(response.content), rows)
+
+        response = self.client.get("/countries", HTTP_ACCEPT="application/msgpack")
+        self.assertEqual(response["Content-Type"], "application/msgpack")
+        self.assertEqual(msgpack.unpackb(response.content), rows)
+
+    def test_columnar_layout(self):
+        rows = self.client.get("/countries?sort=name").json()
+
+        data = self.client.get("/countries?format=columnar&sort=name").json()
+        self.assertEqual(data["count"], 3)
+        self.assertEqual(data["fields"], list(rows[0]))
+        self.assertEqual(data["columns"]["name"], [row["name"] for row in rows])
+
+    def test_columnar_empty_keeps_shape(self):
+        data = self.client.get("/countries?format=columnar&region=nowhere").json()
+        self.assertEqual(data["count"], 0)
+        self.assertIn("name", data["fields"])
+        self.assertEqual(data["columns"], {field: [] for field in data["fields"]})
+
+    def test_gzip_when_accepted(self):
+        rows = self.client.get("/countries").json()
+
+        response = self.client.get("/countries", HTTP_ACCEPT_ENCODING="gzip")
+        self.assertEqual(response["Content-Encoding"], "gzip")
+        self.assertIn("Accept-Encoding", response["Vary"])
+        self.assertEqual(json.loads(gzip.decompress(response.content)), rows)
+
+        # second hit is served from the cache with the same bytes
+        cached = self.client.get("/countries", HTTP_ACCEPT_ENCODING="gzip")
+        self.assertEqual(cached["Content-Encoding"], "gzip")
+        self.assertEqual(cached.content, response.content)
+
+    def test_not_modified_on_matching_etag(self):
+        etag = self.client.get("/countries")["ETag"]
+
+        response = self.client.get("/countries", HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, 304)
+
+
+@mock.patch.object(services, "_generate_summary_image")
+@mock.patch.object(services, "_fetch_api_data", side_effect=_fake_fetch)
+class CountryListRefreshTests(TestCase):
+    def setUp(self):
+        cache.clear()
+
+    def test_etag_changes_after_refresh(self, fetch, image):
+        services.refresh_country_data()
+        first = self.client.get("/countries")
+        etag = first["ETag"]
+
+        # second refresh only updates existing rows
+        services.refresh_country_data()
+
+        response = self.client.get("/countries", HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, 200)
+        self.assertNotEqual(response["ETag"], etag)
+        self.assertNotEqual(response.json(), first.json())
+
+
+def _results(**overrides):
+    stats = {
+        "requests": 100, "errors": 0, "p50_ms": 10.0, "p95_ms": 20.0, "p99_ms": 25.0,
+        "throughput_rps": 100.0, "queries_per_request": 2.0,
+    }
+    stats.update(overrides)
+    return {
+        "meta": {"rows": 10, "concurrency": 2, "requests": 100, "refresh_runs": 1, "repeat": 1},
+        "scenarios": {"GET /countries (cold)": stats, "GET /status": dict(stats)},
+    }
+
+
+class BenchmarkCompareTests(SimpleTestCase):
+    def compare(self, results, baseline, **kwargs):
+        stderr = io.StringIO()
+        BenchmarkCommand(stdout=io.StringIO(), stderr=stderr)._compare(
+            results, baseline, Path("baseline.json"), 0.10, **kwargs
+        )
+        return stderr.getvalue()
+
+    def test_identical_results_pass(self):
+        self.compare(_results(), _results())
+
+    def test_meta_mismatch_fails(self):
+        baseline = _results()
+        baseline["meta"]["rows"] = 5000
+        with self.assertRaisesMessage(CommandError, "rows: baseline 5000 vs current 10"):
+            self.compare(_results(), baseline)
+
+    def test_scenario_missing_on_either_side_fails(self):
+        baseline = _results()
+        del baseline["scenarios"]["GET /status"]
+        with self.assertRaisesMessage(CommandError, "GET /status: missing from baseline"):
+            self.compare(_results(), baseline)
+
+        current = _results()
+        del current["scenarios"]["GET /status"]
+        with self.assertRaisesMessage(CommandError, "GET /status: missing from this run"):
+            self.compare(current, _results())
+
+    def test_extra_queries_fail(self):
+        with self.assertRaisesMessage(CommandError, "queries/request 2.0 -> 3.0"):
+            self.compare(_results(queries_per_request=3.0), _results())
+
+    def test_timing_regressions_warn_unless_strict(self):
+        slower = _results(p50_ms=20.0, throughput_rps=50.0)
+
+        warnings = self.compare(slower, _results())
+        self.assertIn("p50 10.0ms -> 20.0ms", warnings)
+        self.assertIn("throughput 100.0 -> 50.0 req/s", warnings)
+
+        with self.assertRaisesMessage(CommandError, "p50 10.0ms -> 20.0ms"):
+            self.compare(slower, _results(), strict_timing=True)
+        with self.assertRaisesMessage(CommandError, "throughput 100.0 -> 50.0 req/s"):
+            self.compare(slower, _results(), strict_timing=True)
+
+    def test_timing_within_noise_floor_passes(self):
+        # 10ms -> 11.5ms is past 10% but under the 2ms floor, p95 is reported only
+        self.compare(_results(p50_ms=11.5, p95_ms=40.0), _results(), strict_timing=True)
+
+    def test_percentile(self):
+        self.assertEqual(_percentile([], 95), 0.0)
+        self.assertEqual(_percentile([7.0], 95), 7.0)
+        samples = [float(i) for i in range(1, 101)]
+        self.assertEqual(_percentile(samples, 50), 50.5)
+        self.assertAlmostEqual(_percentile(samples, 95), 95.05)
+
+
+@skipUnless(connection.vendor == "sqlite", "the benchmark command only runs on SQLite")
+class BenchmarkCommandTests(TransactionTestCase):
+    def setUp(self):
+        cache.clear()
+        tmp = tempfile.TemporaryDirectory()
+        self.addCleanup(tmp.cleanup)
+        self.tmp = Path(tmp.name)
+
+    def call(self, **options):
+        return call_command("benchmark", stdout=io.StringIO(), stderr=io.StringIO(), **options)
+
+    def test_rejects_compare_equal_to_output(self):
+        output = self.tmp / "latest.json"
+        with self.assertRaisesMessage(CommandError, "would overwrite its own baseline"):
+            self.call(output=str(output), compare=str(output))
+
+    def test_rejects_non_positive_counts(self):
+        for option in ("rows", "requests", "concurrency", "refresh_runs", "repeat"):
+            with self.subTest(option=option):
+                with self.assertRaisesMessage(CommandError, "must be at least 1"):
+                    self.call(**{option: 0})
+
+    def test_end_to_end_run(self):
+        media = self.tmp / "media"
+        output = self.tmp / "results.json"
+        with override_settings(MEDIA_ROOT=media), \
+                mock.patch.object(services, "IMAGE_CACHE_DIR", media / "cache"), \
+                mock.patch.object(services, "IMAGE_PATH", media / "cache" / "summary.png"):
+            self.call(rows=5, requests=2, concurrency=1, refresh_runs=1, repeat=1, output=str(output))
+
+            results = json.loads(output.read_text())
+            self.assertEqual(results["meta"]["rows"], 5)
+            self.assertIn("POST /countries/refresh", results["scenarios"])
+            self.assertIn("GET /countries (cold)", results["scenarios"])
+            self.assertIn("GET /countries (cached)", results["scenarios"])
+            for name, stats in results["scenarios"].items():
+                self.assertEqual(stats["errors"], 0, name)
+                self.assertEqual(
+                    set(stats),
+                    {"requests", "errors", "p50_ms", "p95_ms", "p99_ms", "throughput_rps", "queries_per_request"},
+                )
+
+            # a rerun of the same tree compares cleanly against the first run
+            self.call(
+                rows=5, requests=2, concurrency=1, refresh_runs=1, repeat=1,
+                output=str(self.tmp / "rerun.json"), compare=str(output),
+            )
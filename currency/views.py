@@ -5,9 +5,14 @@ from rest_framework.response import Response
 from .models import Country
 from .filters import CountryFilter, CustomOrdering
 from .serializers import CountrySerializer
+from .renderers import MessagePackRenderer, ColumnarJSONRenderer
+from .caching import cache_dataset_response
 from django_filters.rest_framework import DjangoFilterBackend
 from django.conf import settings
 from django.http import HttpResponse, Http404
+from django.db.models import Count, Max
+from django.utils.decorators import method_decorator
+from rest_framework.settings import api_settings
 import os
 from .exceptions import ExternalApiException
 
@@ -25,12 +30,20 @@ def refresh_countries(request):
     except Exception as e:
         return Response({"message": f"error fetching countries: {e}"})
     
+def _dataset_version():
+    """changes whenever countries are added, removed or refreshed"""
+    version = Country.objects.aggregate(total=Count("id"), latest=Max("last_refreshed_at"))
+    return f"{version['total']}:{version['latest']}"
+
+
+@method_decorator(cache_dataset_response(_dataset_version, prefix="countries", timeout=settings.COUNTRIES_CACHE_TIMEOUT), name="dispatch")
 class AllCountries(generics.ListAPIView):
     """"""
     queryset = Country.objects.all()
     serializer_class = CountrySerializer
     filterset_class = CountryFilter
     filter_backends = [DjangoFilterBackend, CustomOrdering]
+    renderer_classes = api_settings.DEFAULT_RENDERER_CLASSES + [MessagePackRenderer, ColumnarJSONRenderer]
 
     ordering_fields = {
         "gdp_desc": "-estimated_gdp",